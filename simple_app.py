@@ -7,22 +7,33 @@
 """
 
 import os
-import json
+import orjson
 import hashlib
+import itertools
 import logging
 import mysql.connector
+from mysql.connector import pooling
 import redis
 import requests
+from requests.adapters import HTTPAdapter
 import base64
-from datetime import datetime, timedelta
+import io
+from datetime import datetime
 from typing import Dict, Optional, List
-from flask import Flask, request, jsonify
-from flask_restx import Api, Resource, fields, reqparse
+from flask import Flask, request, make_response, current_app
+from flask_restx import Api, Resource, fields
 from flask_cors import CORS
 from werkzeug.datastructures import FileStorage
 from openai import OpenAI
+from PIL import Image, ImageOps
 from dotenv import load_dotenv
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from types import MappingProxyType
 
 # 환경변수 로드
 load_dotenv()
@@ -32,6 +43,7 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
+logger = logging.getLogger(__name__)
 
 # Flask 앱 설정
 app = Flask(__name__)
@@ -40,6 +52,7 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
 # CORS 설정 - 다른 포트의 웹서버에서 접근 허용
 CORS(app, resources={
     r"/process": {"origins": "*"},  # 모든 도메인에서 /process 엔드포인트 접근 허용
+    r"/process/batch": {"origins": "*"},  # 모든 도메인에서 /process/batch 엔드포인트 접근 허용
     r"/health": {"origins": "*"}    # 모든 도메인에서 /health 엔드포인트 접근 허용
 })
 
@@ -52,6 +65,17 @@ api = Api(
     doc='/'
 )
 
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """orjson 기반 JSON 응답 직렬화 (한글은 이스케이프 없이 UTF-8로 출력)"""
+    option = orjson.OPT_APPEND_NEWLINE
+    if current_app.debug:
+        option |= orjson.OPT_INDENT_2
+    
+    response = make_response(orjson.dumps(data, option=option), code)
+    response.headers.extend(headers or {})
+    return response
+
 # API 모델 정의
 receipt_model = api.model('Receipt', {
     'image': fields.Raw(required=True, description='영수증 이미지 파일')
@@ -61,12 +85,23 @@ receipt_model = api.model('Receipt', {
 upload_parser = api.parser()
 upload_parser.add_argument('image', location='files', type=FileStorage, required=True, help='영수증 이미지 파일 (JPG, PNG)')
 
+batch_upload_parser = api.parser()
+batch_upload_parser.add_argument('images', location='files', type=FileStorage, required=True, action='append', help='영수증 이미지 파일 목록 (JPG, PNG)')
+
 response_model = api.model('ReceiptResponse', {
     'success': fields.Boolean(description='처리 성공 여부'),
     'data': fields.Raw(description='추출된 영수증 데이터 (amount, usageDateTime, usageLocation, accountCategory, description)'),
     'reasoning': fields.Raw(description='AI 판단 과정 및 추론 근거 (5단계 상세 분석)'),
     'processing_time': fields.String(description='처리 소요 시간'),
-    'cache_used': fields.Boolean(description='캐시 사용 여부')
+    'cache_used': fields.Boolean(description='캐시 사용 여부'),
+    'error': fields.String(description='처리 실패 시 오류 메시지')
+})
+
+batch_response_model = api.model('ReceiptBatchResponse', {
+    'success': fields.Boolean(description='일괄 처리 요청 성공 여부'),
+    'results': fields.Raw(description='업로드 순서대로 정렬된 영수증별 처리 결과 (filename, success, data, reasoning, error 등)'),
+    'processing_time': fields.String(description='전체 처리 소요 시간'),
+    'error': fields.String(description='요청 자체가 거부된 경우의 오류 메시지')
 })
 
 # 환경변수 설정
@@ -84,52 +119,223 @@ class Config:
     DB_USER = os.getenv('DB_USER')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
     DB_NAME = os.getenv('DB_NAME')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    
+    # 일괄 처리
+    OCR_CONCURRENCY = int(os.getenv('OCR_CONCURRENCY', 4))
+    BATCH_MAX_IMAGES = int(os.getenv('BATCH_MAX_IMAGES', 20))
+    
+    # OCR 전송 전 이미지 축소 (이 크기 이상인 파일만 긴 변 기준 픽셀로 축소, 0이면 비활성화)
+    OCR_RESIZE_MIN_BYTES = int(os.getenv('OCR_RESIZE_MIN_BYTES', 2 * 1024 * 1024))
+    OCR_MAX_IMAGE_EDGE = int(os.getenv('OCR_MAX_IMAGE_EDGE', 2560))
+    # 이 픽셀 수를 넘는 이미지는 디코딩하지 않고 원본 전송 (워커별 메모리 사용량 제한)
+    OCR_RESIZE_MAX_PIXELS = int(os.getenv('OCR_RESIZE_MAX_PIXELS', 50_000_000))
+    
+    # Redis 미연결 시 사용하는 프로세스 내부 캐시 최대 항목 수
+    LOCAL_CACHE_SIZE = int(os.getenv('LOCAL_CACHE_SIZE', 256))
+
+# 캐시 유효시간 (초)
+CACHE_TTL_OCR = 24 * 3600       # OCR 텍스트 - 24시간
+CACHE_TTL_LLM = 2 * 3600        # LLM 데이터 추출 - 2시간
+CACHE_TTL_PATTERN = 30 * 60     # DB 패턴 - 30분
+CACHE_TTL_JUDGMENT = 30 * 60    # LLM 최종 판단 - 30분
+CACHE_TTL_COMPLETE = 3600       # 전체 처리 결과 - 1시간
 
 # Redis 클라이언트
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=1, decode_responses=True)
+    # 스레드 간 공유하는 연결 풀 (Redis 지연 시 요청이 무기한 대기하지 않도록 타임아웃 설정)
+    redis_pool = redis.BlockingConnectionPool(
+        host='localhost', port=6379, db=1, decode_responses=True,
+        max_connections=64, timeout=1,
+        socket_connect_timeout=1, socket_timeout=2
+    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     redis_client.ping()
-    logging.info("✅ Redis 연결 성공")
-except:
+    logger.info("✅ Redis 연결 성공")
+except redis.RedisError:
     redis_client = None
-    logging.warning("❌ Redis 연결 실패 - 캐시 없이 동작")
+    logger.warning("❌ Redis 연결 실패 - 프로세스 내부 캐시로 동작")
+
+class LocalCache:
+    """Redis 미연결 시 사용하는 프로세스 내부 LRU 캐시 (TTL 지원, 스레드 안전)"""
+    
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items = OrderedDict()  # key -> (만료 시각, 직렬화된 값)
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+    
+    def setex(self, key: str, expire_seconds: int, value: bytes):
+        with self._lock:
+            self._items[key] = (time.monotonic() + expire_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+local_cache = LocalCache(Config.LOCAL_CACHE_SIZE)
 
 # OpenAI 클라이언트
 openai_client = OpenAI(api_key=Config.OPENAI_API_KEY) if Config.OPENAI_API_KEY else None
 
+# CLOVA OCR HTTP 세션 (TLS 연결 재사용)
+ocr_session = requests.Session()
+ocr_session.mount('https://', HTTPAdapter(pool_maxsize=max(10, Config.OCR_CONCURRENCY)))
+
+# CLOVA OCR 동시 호출 제한 (/process, /process/batch 공용)
+ocr_semaphore = threading.BoundedSemaphore(Config.OCR_CONCURRENCY)
+
+# CLOVA OCR requestId 일련번호 (같은 초에 들어온 요청 구분)
+ocr_request_counter = itertools.count(1)
+
+# 요일 이름 (datetime.weekday() 인덱스 순, 0=월요일)
+WEEKDAY_NAMES = ('월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일')
+
+# 시간(0~23시)별 (시간대, 근무 유형)
+def _hour_period(hour: int) -> tuple:
+    if 6 <= hour < 11:
+        return ("오전", "조식/오전 업무")
+    elif 11 <= hour < 14:
+        return ("점심", "점심식대")
+    elif 14 <= hour < 18:
+        return ("오후", "오후 업무")
+    elif 18 <= hour < 22:
+        return ("야근", "야근식대")
+    else:  # 22시 이후 또는 6시 이전
+        return ("심야", "심야 야근식대")
+
+HOUR_PERIODS = tuple(_hour_period(hour) for hour in range(24))
+
+# 날짜/시간 분석 실패 시 기본값 (읽기 전용 - 반환 시 복사)
+DEFAULT_DATETIME_ANALYSIS = MappingProxyType({
+    "weekday": "알 수 없음",
+    "day_type": "알 수 없음",
+    "hour": 12,
+    "time_period": "점심",
+    "work_type": "점심식대",
+    "work_context": "기본 식대",
+    "is_weekend": False,
+    "is_overtime": False
+})
+
+# 정규식 (모듈 로드 시 한 번만 컴파일)
+NON_DIGIT_RE = re.compile(r'[^\d]')
+DATETIME_NOISE_RE = re.compile(r'[^\d\-/.:년월일시분초·]')  # 중간점 · 보존
+WHITESPACE_RE = re.compile(r'\s+')
+
+# 날짜/시간 정형화 패턴 (위에서부터 순서대로 시도, formatter(match, now) → 'YYYY-MM-DD HH:mm:ss')
+DATETIME_PATTERNS = (
+    # 24.12.18·18:31:21 형태 (YY.MM.DD·HH:mm:ss) - 중간점 포함
+    (re.compile(r'(\d{2})\.(\d{1,2})\.(\d{1,2})[·\s]+(\d{1,2}):(\d{2}):(\d{2})'), 
+     lambda m, now: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
+
+    # 25.1.2.19:11:30 형태 (YY.M.D.HH:mm:ss) - 점으로 구분
+    (re.compile(r'(\d{2})\.(\d{1,2})\.(\d{1,2})\.(\d{1,2}):(\d{2}):(\d{2})'), 
+     lambda m, now: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
+
+    # 2025.1.2 19:11:30 형태 (YYYY.M.D HH:mm:ss)
+    (re.compile(r'(\d{4})\.(\d{1,2})\.(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})'), 
+     lambda m, now: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
+
+    # 2025/01/02 19:11:30 형태 (YYYY/MM/DD HH:mm:ss)
+    (re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})'), 
+     lambda m, now: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
+
+    # 25-01-02 19:11 형태 (YY-MM-DD HH:mm)
+    (re.compile(r'(\d{2})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})'), 
+     lambda m, now: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:00"),
+
+    # 2025년 1월 2일 19시 11분 30초 형태
+    (re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2})시\s*(\d{1,2})분\s*(\d{1,2})초'), 
+     lambda m, now: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
+
+    # 2025년 1월 2일 19시 11분 형태
+    (re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2})시\s*(\d{1,2})분'), 
+     lambda m, now: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:00"),
+
+    # 01/02 19:11 형태 (MM/DD HH:mm) - 올해로 가정
+    (re.compile(r'(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{2})'), 
+     lambda m, now: f"{now.year}-{m.group(1):0>2}-{m.group(2):0>2} {m.group(3):0>2}:{m.group(4)}:00"),
+
+    # 19:11:30 형태 (HH:mm:ss) - 오늘 날짜로 가정
+    (re.compile(r'^(\d{1,2}):(\d{2}):(\d{2})$'), 
+     lambda m, now: f"{now:%Y-%m-%d} {m.group(1):0>2}:{m.group(2)}:{m.group(3)}"),
+
+    # 19:11 형태 (HH:mm) - 오늘 날짜로 가정
+    (re.compile(r'^(\d{1,2}):(\d{2})$'), 
+     lambda m, now: f"{now:%Y-%m-%d} {m.group(1):0>2}:{m.group(2)}:00"),
+
+    # 2025-01-02 형태 (YYYY-MM-DD) - 기본 시간 12:00:00
+    (re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$'), 
+     lambda m, now: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} 12:00:00"),
+)
+
 class ReceiptProcessor:
     """영수증 처리 메인 클래스"""
     
     def __init__(self):
         self.config = Config()
+        self._guide_cache = None  # (파일 수정 시각, 가이드 내용)
+        self._db_pool = None
+        self._db_pool_lock = threading.Lock()
+        self._inflight = {}  # 이미지 해시 -> [잠금, 대기 요청 수]
+        self._inflight_lock = threading.Lock()
         
     def get_image_hash(self, image_data: bytes) -> str:
         """이미지 SHA-256 해시 생성"""
         return hashlib.sha256(image_data).hexdigest()
     
+    def get_text_hash(self, text: str) -> str:
+        """OCR 텍스트 해시 생성 (공백/줄바꿈 차이는 무시)"""
+        normalized = ' '.join(text.split())
+        return hashlib.md5(normalized.encode()).hexdigest()
+    
+    @contextmanager
+    def single_flight(self, key: str):
+        """같은 키의 작업이 동시에 실행되지 않도록 직렬화 (키별 잠금)"""
+        with self._inflight_lock:
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._inflight_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[key]
+    
     def get_redis_cache(self, key: str) -> Optional[Dict]:
-        """Redis 캐시 조회"""
-        if not redis_client:
-            return None
+        """Redis 캐시 조회 (Redis 미연결 시 프로세스 내부 캐시 사용)"""
+        cache = redis_client or local_cache
         
         try:
-            cached_data = redis_client.get(key)
+            cached_data = cache.get(key)
             if cached_data:
-                return json.loads(cached_data)
+                return orjson.loads(cached_data)
         except Exception as e:
-            logging.warning(f"Redis 조회 실패: {e}")
+            logger.warning("Redis 조회 실패: %s", e)
         
         return None
     
     def set_redis_cache(self, key: str, data: Dict, expire_seconds: int = 3600):
-        """Redis 캐시 저장"""
-        if not redis_client:
-            return
+        """Redis 캐시 저장 (Redis 미연결 시 프로세스 내부 캐시 사용)"""
+        cache = redis_client or local_cache
         
         try:
-            redis_client.setex(key, expire_seconds, json.dumps(data, ensure_ascii=False))
+            cache.setex(key, expire_seconds, orjson.dumps(data))
         except Exception as e:
-            logging.warning(f"Redis 저장 실패: {e}")
+            logger.warning("Redis 저장 실패: %s", e)
     
     def call_naver_ocr(self, image_data: bytes) -> Dict:
         """네이버 CLOVA OCR API 호출"""
@@ -137,8 +343,9 @@ class ReceiptProcessor:
             return {"error": "CLOVA OCR API 키가 설정되지 않았습니다"}
         
         try:
-            # 이미지를 base64로 인코딩
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
+            # 큰 이미지는 축소 후 base64로 인코딩
+            image_base64 = base64.b64encode(self.downscale_for_ocr(image_data)).decode('utf-8')
+            now = datetime.now()
             
             # API 요청 데이터
             request_data = {
@@ -147,9 +354,9 @@ class ReceiptProcessor:
                     "name": "receipt",
                     "data": image_base64
                 }],
-                "requestId": f"receipt_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "requestId": f"receipt_{now.strftime('%Y%m%d_%H%M%S')}_{next(ocr_request_counter)}",
                 "version": "V2",
-                "timestamp": int(datetime.now().timestamp() * 1000)
+                "timestamp": int(now.timestamp() * 1000)
             }
             
             # API 헤더
@@ -158,49 +365,73 @@ class ReceiptProcessor:
                 "Content-Type": "application/json"
             }
             
-            # API 호출
-            response = requests.post(
-                self.config.CLOVA_OCR_ENDPOINT,
-                headers=headers,
-                json=request_data,
-                timeout=30
-            )
+            # API 호출 (프로세스 전체 동시 호출 수 제한)
+            with ocr_semaphore:
+                response = ocr_session.post(
+                    self.config.CLOVA_OCR_ENDPOINT,
+                    headers=headers,
+                    data=orjson.dumps(request_data),
+                    timeout=30
+                )
             
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
-            logging.error(f"네이버 OCR API 호출 실패: {e}")
+            logger.error("네이버 OCR API 호출 실패: %s", e)
             return {"error": str(e)}
     
+    def downscale_for_ocr(self, image_data: bytes) -> bytes:
+        """큰 이미지를 긴 변 OCR_MAX_IMAGE_EDGE 픽셀의 JPEG로 축소 (전송량 절감, 실패 시 원본 사용)"""
+        max_edge = self.config.OCR_MAX_IMAGE_EDGE
+        if max_edge <= 0 or len(image_data) < self.config.OCR_RESIZE_MIN_BYTES:
+            return image_data
+        
+        try:
+            with Image.open(io.BytesIO(image_data)) as img:
+                if max(img.size) <= max_edge:
+                    return image_data
+                if img.width * img.height > self.config.OCR_RESIZE_MAX_PIXELS:
+                    logger.warning("이미지 픽셀 수 초과 - 축소 없이 원본 전송: %sx%s", img.width, img.height)
+                    return image_data
+                
+                # JPEG는 디코딩 단계에서 축소 (전체 해상도 디코딩 생략)
+                img.draft('RGB', (max_edge, max_edge))
+                img.thumbnail((max_edge, max_edge))
+                # 휴대폰 사진의 EXIF 회전 정보는 축소된 이미지에 반영
+                resized = ImageOps.exif_transpose(img)
+                if resized.mode != 'RGB':
+                    resized = resized.convert('RGB')
+                
+                buffer = io.BytesIO()
+                resized.save(buffer, 'JPEG', quality=90, optimize=True)
+        except Exception as e:
+            logger.warning("이미지 축소 실패 - 원본 전송: %s", e)
+            return image_data
+        
+        resized_data = buffer.getvalue()
+        if len(resized_data) >= len(image_data):
+            return image_data
+        
+        logger.info("🖼️ OCR 이미지 축소: %sKB → %sKB", len(image_data) // 1024, len(resized_data) // 1024)
+        return resized_data
+    
     def extract_text_from_ocr(self, ocr_result: Dict) -> str:
         """OCR 결과에서 텍스트 추출"""
         try:
-            text_blocks = []
+            images = ocr_result.get('images')
+            if not images:
+                return ""
             
-            if 'images' in ocr_result and ocr_result['images']:
-                image = ocr_result['images'][0]
-                if 'fields' in image:
-                    for field in image['fields']:
-                        if 'inferText' in field:
-                            text_blocks.append(field['inferText'])
-            
-            return '\n'.join(text_blocks)
+            fields = images[0].get('fields', ())
+            return '\n'.join(field['inferText'] for field in fields if 'inferText' in field)
             
         except Exception as e:
-            logging.error(f"OCR 텍스트 추출 실패: {e}")
+            logger.error("OCR 텍스트 추출 실패: %s", e)
             return ""
     
     def extract_data_with_llm(self, ocr_text: str) -> Dict:
-        """OCR 텍스트에서 구조화된 데이터 추출"""
-        cache_key = f"receipt:llm:{hashlib.md5(ocr_text.encode()).hexdigest()}"
-        
-        # Redis 캐시 확인
-        cached_result = self.get_redis_cache(cache_key)
-        if cached_result:
-            logging.info("✅ LLM 추출 캐시 적중")
-            return cached_result
-        
+        """OCR 텍스트에서 구조화된 데이터 추출 (결과 캐시는 process_receipt에서 관리)"""
         try:
             prompt = f"""
 다음 영수증 OCR 텍스트에서 정확한 정보를 추출해주세요:
@@ -242,8 +473,8 @@ class ReceiptProcessor:
                 temperature=0.1
             )
             
-            result = json.loads(response.choices[0].message.content)
-            logging.info(f"LLM 원본 데이터 추출 완료: {result}")
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("LLM 원본 데이터 추출 완료: %s", result)
             
             # 날짜/시간 정형화 적용
             raw_datetime = result.get('rawDateTime', '')
@@ -254,7 +485,7 @@ class ReceiptProcessor:
             amount = result.get('amount', 0)
             if isinstance(amount, str):
                 # 문자열인 경우 숫자만 추출
-                amount = re.sub(r'[^\d]', '', amount)
+                amount = NON_DIGIT_RE.sub('', amount)
                 result['amount'] = int(amount) if amount else 0
             
             usage_location = result.get('usageLocation', '')
@@ -262,37 +493,43 @@ class ReceiptProcessor:
                 result['usageLocation'] = '미확인'
             
             # rawDateTime은 디버깅용으로 유지, 최종 응답에서는 제외
-            logging.info(f"날짜 정형화 완료: '{raw_datetime}' → '{normalized_datetime}'")
-            logging.info(f"데이터 검증 완료: 금액={result['amount']}, 사용처={result['usageLocation']}")
-            
-            # 캐시 저장
-            self.set_redis_cache(cache_key, result, 3600)  # 1시간
+            logger.info("날짜 정형화 완료: '%s' → '%s'", raw_datetime, normalized_datetime)
+            logger.info("데이터 검증 완료: 금액=%s, 사용처=%s", result['amount'], result['usageLocation'])
             return result
             
         except Exception as e:
-            logging.error(f"LLM 데이터 추출 실패: {e}")
+            logger.error("LLM 데이터 추출 실패: %s", e)
             return {"error": str(e)}
     
-    def get_db_patterns(self, usage_location: str) -> List[Dict]:
-        """구매처 기반으로 과거 패턴 조회"""
-        cache_key = f"receipt:pattern:{hashlib.md5(usage_location.encode()).hexdigest()}"
+    def get_db_connection(self):
+        """MySQL 연결 획득 (요청 간 공유하는 연결 풀 사용, 풀 소진 시 직접 연결)"""
+        db_params = {
+            "host": self.config.DB_HOST,
+            "port": self.config.DB_PORT,
+            "user": self.config.DB_USER,
+            "password": self.config.DB_PASSWORD,
+            "database": self.config.DB_NAME
+        }
         
-        # Redis 캐시 확인
-        cached_patterns = self.get_redis_cache(cache_key)
-        if cached_patterns:
-            logging.info(f"✅ DB 패턴 캐시 적중: {len(cached_patterns)} 패턴")
-            return cached_patterns
+        # 첫 사용 시 연결 풀 생성
+        if self._db_pool is None:
+            with self._db_pool_lock:
+                if self._db_pool is None:
+                    self._db_pool = pooling.MySQLConnectionPool(
+                        pool_name="receipt_pool",
+                        pool_size=self.config.DB_POOL_SIZE,
+                        **db_params
+                    )
         
         try:
-            conn = mysql.connector.connect(
-                host=self.config.DB_HOST,
-                port=self.config.DB_PORT,
-                user=self.config.DB_USER,
-                password=self.config.DB_PASSWORD,
-                database=self.config.DB_NAME
-            )
-            cursor = conn.cursor(dictionary=True)
-            
+            return self._db_pool.get_connection()
+        except mysql.connector.errors.PoolError:
+            logger.warning("DB 연결 풀 소진 - 직접 연결 사용")
+            return mysql.connector.connect(**db_params)
+    
+    def get_db_patterns(self, usage_location: str) -> Optional[List[Dict]]:
+        """구매처 기반으로 과거 패턴 조회 (조회 실패 시 None, 결과 캐시는 process_receipt에서 관리)"""
+        try:
             # usageLocation 필드에서 구매처 기반 패턴 조회 (정확도 향상)
             query = """
             SELECT accountCategory, description, COUNT(*) as frequency,
@@ -314,29 +551,28 @@ class ReceiptProcessor:
             starts_with = f"{usage_location}%"
             contains = f"%{usage_location}%"
             
-            cursor.execute(query, (exact_match, starts_with, contains, exact_match, starts_with, contains))
-            patterns = cursor.fetchall()
+            # 커서 생성이 실패해도 연결은 반드시 닫힘 (풀 연결은 close() 시 풀로 반환됨)
+            with closing(self.get_db_connection()) as conn, closing(conn.cursor(dictionary=True)) as cursor:
+                cursor.execute(query, (exact_match, starts_with, contains, exact_match, starts_with, contains))
+                patterns = cursor.fetchall()
             
-            cursor.close()
-            conn.close()
-            
-            # Redis에 캐싱 (30분)
-            self.set_redis_cache(cache_key, patterns, 1800)
-            
-            logging.info(f"📊 DB에서 '{usage_location}' 패턴 {len(patterns)}개 조회")
+            logger.info("📊 DB에서 '%s' 패턴 %s개 조회", usage_location, len(patterns))
             return patterns
             
         except Exception as e:
-            logging.error(f"❌ DB 패턴 조회 실패: {e}")
-            return []
+            logger.error("❌ DB 패턴 조회 실패: %s", e)
+            return None
     
     def read_account_category_guide(self) -> str:
-        """계정과목 가이드 문서 읽기"""
+        """계정과목 가이드 문서 읽기 (파일이 변경된 경우에만 다시 읽음)"""
         try:
-            with open('account_category_list.md', 'r', encoding='utf-8') as f:
-                return f.read()
+            mtime = os.path.getmtime('account_category_list.md')
+            if self._guide_cache is None or self._guide_cache[0] != mtime:
+                with open('account_category_list.md', 'r', encoding='utf-8') as f:
+                    self._guide_cache = (mtime, f.read())
+            return self._guide_cache[1]
         except Exception as e:
-            logging.error(f"계정과목 가이드 읽기 실패: {e}")
+            logger.error("계정과목 가이드 읽기 실패: %s", e)
             return ""
     
     def format_db_patterns(self, patterns: List[Dict]) -> str:
@@ -344,31 +580,38 @@ class ReceiptProcessor:
         if not patterns:
             return "해당 사용처에 대한 과거 기록이 없습니다."
         
-        formatted = []
         total_frequency = sum(p['frequency'] for p in patterns)
         
-        for i, pattern in enumerate(patterns[:5]):  # 상위 5개만
-            percentage = (pattern['frequency'] / total_frequency * 100) if total_frequency > 0 else 0
-            relevance = "정확" if pattern.get('relevance_score', 0) >= 2 else "유사"
-            formatted.append(f"{i+1}. {pattern['accountCategory']}: {pattern['description']} (사용횟수: {pattern['frequency']}, 비율: {percentage:.1f}%, 매칭: {relevance})")
-        
-        return "\n".join(formatted)
+        return "\n".join([
+            f"{i}. {pattern['accountCategory']}: {pattern['description']} "
+            f"(사용횟수: {pattern['frequency']}, "
+            f"비율: {(pattern['frequency'] / total_frequency * 100) if total_frequency > 0 else 0:.1f}%, "
+            f"매칭: {'정확' if pattern.get('relevance_score', 0) >= 2 else '유사'})"
+            for i, pattern in enumerate(itertools.islice(patterns, 5), 1)  # 상위 5개만
+        ])
     
-    def final_judgment_with_llm(self, extracted_data: Dict, db_patterns: List[Dict], guide_text: str) -> Dict:
-        """LLM으로 최종 계정과목 및 지출용도 판단"""
-        cache_key = f"receipt:final:{hashlib.md5(str(extracted_data).encode()).hexdigest()}"
+    def final_judgment_with_llm(self, extracted_data: Dict, db_patterns: List[Dict], guide_text: str,
+                                cache_result: bool = True) -> Dict:
+        """LLM으로 최종 계정과목 및 지출용도 판단 (cache_result=False면 결과를 캐시하지 않음)"""
+        amount = extracted_data.get('amount', 0)
+        usage_datetime = extracted_data.get('usageDateTime', '')
+        usage_location = extracted_data.get('usageLocation', '')
+        
+        # 추출된 필드(금액/사용일시/사용처)만으로 캐시 키 생성 (rawDateTime 등 판단과 무관한 필드 제외)
+        judgment_input = orjson.dumps([amount, usage_datetime, usage_location])
+        cache_key = f"receipt:final:{hashlib.md5(judgment_input).hexdigest()}"
         
         # Redis 캐시 확인
         cached_result = self.get_redis_cache(cache_key)
         if cached_result:
-            logging.info("✅ 최종 판단 캐시 적중")
+            logger.info("✅ 최종 판단 캐시 적중")
             return cached_result
         
         # 날짜/시간 분석
-        datetime_analysis = self.analyze_datetime(extracted_data.get('usageDateTime', ''))
+        datetime_analysis = self.analyze_datetime(usage_datetime)
         
         pattern_summary = f"""
-📊 과거 패턴 분석 (usageLocation: '{extracted_data.get('usageLocation', '')}'):
+📊 과거 패턴 분석 (usageLocation: '{usage_location}'):
 {self.format_db_patterns(db_patterns)}
 """ if db_patterns else "📊 과거 패턴: 해당 사용처에 대한 기록이 없습니다."
         
@@ -377,9 +620,9 @@ class ReceiptProcessor:
 영수증 데이터를 분석하여 적절한 계정과목과 지출항목을 결정해주세요.
 
 📋 추출된 데이터:
-- 금액: {extracted_data.get('amount', 0):,}원
-- 사용일시: {extracted_data.get('usageDateTime', '')}
-- 사용처: {extracted_data.get('usageLocation', '')}
+- 금액: {amount:,}원
+- 사용일시: {usage_datetime}
+- 사용처: {usage_location}
 
 🕐 시간 분석 정보:
 - 요일: {datetime_analysis['weekday']} ({datetime_analysis['day_type']})
@@ -419,9 +662,9 @@ class ReceiptProcessor:
 
 다음 JSON 형식으로만 응답해주세요:
 {{
-    "amount": {extracted_data.get('amount', 0)},
-    "usageDateTime": "{extracted_data.get('usageDateTime', '')}",
-    "usageLocation": "{extracted_data.get('usageLocation', '')}",
+    "amount": {amount},
+    "usageDateTime": "{usage_datetime}",
+    "usageLocation": "{usage_location}",
     "accountCategory": "최종_결정된_계정과목",
     "description": "시간분석_기반_구체적_지출항목",
     "reasoning": {{
@@ -448,20 +691,21 @@ class ReceiptProcessor:
                 temperature=0.1
             )
             
-            result = json.loads(response.choices[0].message.content)
-            logging.info(f"LLM 최종 판단 완료: {result}")
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("LLM 최종 판단 완료: %s", result)
             
             # 캐시 저장
-            self.set_redis_cache(cache_key, result, 1800)  # 30분
+            if cache_result:
+                self.set_redis_cache(cache_key, result, CACHE_TTL_JUDGMENT)
             return result
             
         except Exception as e:
-            logging.error(f"LLM 최종 판단 실패: {e}")
+            logger.error("LLM 최종 판단 실패: %s", e)
             return {"error": str(e)}
     
     def process_receipt(self, image_data: bytes) -> Dict:
         """영수증 처리 메인 프로세스"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         cache_used = False
         
         try:
@@ -469,177 +713,146 @@ class ReceiptProcessor:
             image_hash = self.get_image_hash(image_data)
             cache_key = f"receipt:complete:{image_hash}"
             
-            # 2. 전체 결과 캐시 확인
-            cached_result = self.get_redis_cache(cache_key)
-            if cached_result:
-                cache_used = True
-                processing_time = (datetime.now() - start_time).total_seconds()
+            # 동일 이미지 동시 요청은 한 번만 처리 (대기한 요청은 완료된 결과 캐시를 사용)
+            with self.single_flight(image_hash):
+                # 2. 전체 결과 캐시 확인
+                cached_result = self.get_redis_cache(cache_key)
+                if cached_result:
+                    processing_time = time.perf_counter() - start_time
+                    return {
+                        "success": True,
+                        **self.format_final_result(cached_result),
+                        "processing_time": f"{processing_time:.2f}s",
+                        "cache_used": True
+                    }
+                
+                # 3~4. OCR 처리 및 텍스트 추출 (캐시 확인)
+                # 이후 단계는 텍스트만 사용하므로 좌표 등이 포함된 OCR 원본 응답 대신 텍스트만 캐시
+                ocr_cache_key = f"receipt:ocr_text:{image_hash}"
+                cached_ocr = self.get_redis_cache(ocr_cache_key)
+                
+                if cached_ocr:
+                    logger.info("🎯 OCR 캐시 적중")
+                    ocr_text = cached_ocr["text"]
+                    cache_used = True
+                else:
+                    logger.info("📸 네이버 OCR 처리 중...")
+                    ocr_result = self.call_naver_ocr(image_data)
+                    if "error" in ocr_result:
+                        return {"success": False, "error": ocr_result["error"]}
+                    
+                    ocr_text = self.extract_text_from_ocr(ocr_result)
+                    if not ocr_text:
+                        return {"success": False, "error": "OCR 텍스트 추출 실패"}
+                    self.set_redis_cache(ocr_cache_key, {"text": ocr_text}, CACHE_TTL_OCR)
+                
+                # 5. LLM 데이터 추출 (캐시 확인)
+                text_hash = self.get_text_hash(ocr_text)
+                llm_cache_key = f"receipt:llm:{text_hash}"
+                extracted_data = self.get_redis_cache(llm_cache_key)
+                
+                if not extracted_data:
+                    logger.info("🤖 LLM 데이터 추출 중...")
+                    extracted_data = self.extract_data_with_llm(ocr_text)
+                    if "error" not in extracted_data:
+                        self.set_redis_cache(llm_cache_key, extracted_data, CACHE_TTL_LLM)
+                else:
+                    logger.info("🎯 LLM 캐시 적중")
+                    cache_used = True
+                
+                if "error" in extracted_data:
+                    return {"success": False, "error": extracted_data["error"]}
+                
+                # 6. DB 패턴 조회 (캐시 확인)
+                usage_location = extracted_data.get('usageLocation', '')
+                pattern_cache_key = f"receipt:pattern:{hashlib.md5(usage_location.encode()).hexdigest()}"
+                db_patterns = self.get_redis_cache(pattern_cache_key)
+                patterns_failed = False
+                
+                # 과거 기록이 없는 사용처([])도 캐시 적중으로 처리해 DB 재조회 방지
+                if db_patterns is not None:
+                    logger.info("🎯 패턴 캐시 적중")
+                    cache_used = True
+                else:
+                    logger.info("🗄️ DB 패턴 조회 중...")
+                    db_patterns = self.get_db_patterns(usage_location)
+                    if db_patterns is None:
+                        # 일시적인 DB 오류는 캐시하지 않고 패턴 없이 진행 (이후 판단/전체 결과도 캐시하지 않음)
+                        db_patterns = []
+                        patterns_failed = True
+                    else:
+                        self.set_redis_cache(pattern_cache_key, db_patterns, CACHE_TTL_PATTERN)
+                
+                # 7. 계정과목 가이드 읽기
+                guide_text = self.read_account_category_guide()
+                
+                # 8. LLM 최종 판단
+                logger.info("🧠 LLM 최종 판단 중...")
+                final_result = self.final_judgment_with_llm(
+                    extracted_data, db_patterns, guide_text, cache_result=not patterns_failed
+                )
+                
+                if "error" in final_result:
+                    return {"success": False, "error": final_result["error"]}
+                
+                # 9. 전체 결과 캐시 저장 (패턴 없이 판단한 결과는 재업로드 시 다시 판단하도록 저장하지 않음)
+                if not patterns_failed:
+                    self.set_redis_cache(cache_key, final_result, CACHE_TTL_COMPLETE)
+                
+                processing_time = time.perf_counter() - start_time
+                
+                # 최종 결과 반환
                 return {
                     "success": True,
-                    "data": cached_result,
+                    **self.format_final_result(final_result),
                     "processing_time": f"{processing_time:.2f}s",
                     "cache_used": cache_used
                 }
             
-            # 3. OCR 처리 (캐시 확인)
-            ocr_cache_key = f"receipt:ocr:{image_hash}"
-            ocr_result = self.get_redis_cache(ocr_cache_key)
-            
-            if not ocr_result:
-                logging.info("📸 네이버 OCR 처리 중...")
-                ocr_result = self.call_naver_ocr(image_data)
-                if "error" not in ocr_result:
-                    self.set_redis_cache(ocr_cache_key, ocr_result, 86400)  # 24시간
-            else:
-                logging.info("🎯 OCR 캐시 적중")
-                cache_used = True
-            
-            if "error" in ocr_result:
-                return {"success": False, "error": ocr_result["error"]}
-            
-            # 4. OCR 텍스트 추출
-            ocr_text = self.extract_text_from_ocr(ocr_result)
-            if not ocr_text:
-                return {"success": False, "error": "OCR 텍스트 추출 실패"}
-            
-            # 5. LLM 데이터 추출 (캐시 확인)
-            text_hash = hashlib.md5(ocr_text.encode()).hexdigest()
-            llm_cache_key = f"receipt:llm:{text_hash}"
-            extracted_data = self.get_redis_cache(llm_cache_key)
-            
-            if not extracted_data:
-                logging.info("🤖 LLM 데이터 추출 중...")
-                extracted_data = self.extract_data_with_llm(ocr_text)
-                if "error" not in extracted_data:
-                    self.set_redis_cache(llm_cache_key, extracted_data, 7200)  # 2시간
-            else:
-                logging.info("🎯 LLM 캐시 적중")
-                cache_used = True
-            
-            if "error" in extracted_data:
-                return {"success": False, "error": extracted_data["error"]}
-            
-            # 6. DB 패턴 조회 (캐시 확인)
-            usage_location = extracted_data.get('usageLocation', '')
-            pattern_cache_key = f"receipt:pattern:{hashlib.md5(usage_location.encode()).hexdigest()}"
-            db_patterns = self.get_redis_cache(pattern_cache_key)
-            
-            if not db_patterns:
-                logging.info("🗄️ DB 패턴 조회 중...")
-                db_patterns = self.get_db_patterns(usage_location)
-                self.set_redis_cache(pattern_cache_key, db_patterns, 1800)  # 30분
-            else:
-                logging.info("🎯 패턴 캐시 적중")
-                cache_used = True
-            
-            # 7. 계정과목 가이드 읽기
-            guide_text = self.read_account_category_guide()
-            
-            # 8. LLM 최종 판단
-            logging.info("🧠 LLM 최종 판단 중...")
-            final_result = self.final_judgment_with_llm(extracted_data, db_patterns, guide_text)
-            
-            if "error" in final_result:
-                return {"success": False, "error": final_result["error"]}
-            
-            # 9. 전체 결과 캐시 저장
-            self.set_redis_cache(cache_key, final_result, 3600)  # 1시간
-            
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            # 최종 결과 반환
-            result = {
-                "success": True,
-                "data": {
-                    "amount": final_result.get("amount"),
-                    "usageDateTime": final_result.get("usageDateTime"), 
-                    "usageLocation": final_result.get("usageLocation"),
-                    "accountCategory": final_result.get("accountCategory"),
-                    "description": final_result.get("description")
-                },
-                "reasoning": final_result.get("reasoning", {}),
-                "processing_time": f"{processing_time:.2f}s",
-                "cache_used": cache_used
-            }
-            
-            return result
-            
         except Exception as e:
-            logging.error(f"영수증 처리 실패: {e}")
+            logger.error("영수증 처리 실패: %s", e)
             return {"success": False, "error": str(e)}
 
+    def format_final_result(self, final_result: Dict) -> Dict:
+        """LLM 최종 판단 결과를 API 응답의 data/reasoning 형태로 변환 (캐시 적중 시에도 동일한 형태 유지)"""
+        return {
+            "data": {
+                "amount": final_result.get("amount"),
+                "usageDateTime": final_result.get("usageDateTime"),
+                "usageLocation": final_result.get("usageLocation"),
+                "accountCategory": final_result.get("accountCategory"),
+                "description": final_result.get("description")
+            },
+            "reasoning": final_result.get("reasoning", {})
+        }
+    
     def normalize_datetime(self, datetime_str: str) -> str:
         """다양한 날짜/시간 형식을 표준 형식(YYYY-MM-DD HH:mm:ss)으로 정형화"""
+        # 현재 시각은 한 번만 조회 (연도/날짜 보정과 실패 시 기본값에 공통 사용)
+        now = datetime.now()
         if not datetime_str or datetime_str.strip() == "":
-            return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            return now.strftime('%Y-%m-%d %H:%M:%S')
         
         # 공백 및 특수문자 정리 (중간점 · 보존)
-        cleaned = re.sub(r'[^\d\-/.:년월일시분초·]', ' ', datetime_str.strip())
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # 다양한 패턴들
-        patterns = [
-            # 24.12.18·18:31:21 형태 (YY.MM.DD·HH:mm:ss) - 중간점 포함
-            (r'(\d{2})\.(\d{1,2})\.(\d{1,2})[·\s]+(\d{1,2}):(\d{2}):(\d{2})', 
-             lambda m: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
-            
-            # 25.1.2.19:11:30 형태 (YY.M.D.HH:mm:ss) - 점으로 구분
-            (r'(\d{2})\.(\d{1,2})\.(\d{1,2})\.(\d{1,2}):(\d{2}):(\d{2})', 
-             lambda m: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
-            
-            # 2025.1.2 19:11:30 형태 (YYYY.M.D HH:mm:ss)
-            (r'(\d{4})\.(\d{1,2})\.(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})', 
-             lambda m: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
-            
-            # 2025/01/02 19:11:30 형태 (YYYY/MM/DD HH:mm:ss)
-            (r'(\d{4})/(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})', 
-             lambda m: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
-            
-            # 25-01-02 19:11 형태 (YY-MM-DD HH:mm)
-            (r'(\d{2})-(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})', 
-             lambda m: f"20{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:00"),
-            
-            # 2025년 1월 2일 19시 11분 30초 형태
-            (r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2})시\s*(\d{1,2})분\s*(\d{1,2})초', 
-             lambda m: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:{m.group(6)}"),
-            
-            # 2025년 1월 2일 19시 11분 형태
-            (r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2})시\s*(\d{1,2})분', 
-             lambda m: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} {m.group(4):0>2}:{m.group(5)}:00"),
-            
-            # 01/02 19:11 형태 (MM/DD HH:mm) - 올해로 가정
-            (r'(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{2})', 
-             lambda m: f"{datetime.now().year}-{m.group(1):0>2}-{m.group(2):0>2} {m.group(3):0>2}:{m.group(4)}:00"),
-            
-            # 19:11:30 형태 (HH:mm:ss) - 오늘 날짜로 가정
-            (r'^(\d{1,2}):(\d{2}):(\d{2})$', 
-             lambda m: f"{datetime.now().strftime('%Y-%m-%d')} {m.group(1):0>2}:{m.group(2)}:{m.group(3)}"),
-            
-            # 19:11 형태 (HH:mm) - 오늘 날짜로 가정
-            (r'^(\d{1,2}):(\d{2})$', 
-             lambda m: f"{datetime.now().strftime('%Y-%m-%d')} {m.group(1):0>2}:{m.group(2)}:00"),
-            
-            # 2025-01-02 형태 (YYYY-MM-DD) - 기본 시간 12:00:00
-            (r'^(\d{4})-(\d{1,2})-(\d{1,2})$', 
-             lambda m: f"{m.group(1)}-{m.group(2):0>2}-{m.group(3):0>2} 12:00:00"),
-        ]
+        cleaned = DATETIME_NOISE_RE.sub(' ', datetime_str.strip())
+        cleaned = WHITESPACE_RE.sub(' ', cleaned).strip()
         
         # 패턴 매칭 시도
-        for pattern, formatter in patterns:
-            match = re.search(pattern, cleaned)
+        for pattern, formatter in DATETIME_PATTERNS:
+            match = pattern.search(cleaned)
             if match:
                 try:
-                    result = formatter(match)
+                    result = formatter(match, now)
                     # 유효한 날짜인지 검증
                     datetime.strptime(result, '%Y-%m-%d %H:%M:%S')
-                    logging.info(f"날짜 정형화 성공: '{datetime_str}' → '{result}'")
+                    logger.info("날짜 정형화 성공: '%s' → '%s'", datetime_str, result)
                     return result
                 except ValueError:
                     continue
         
         # 모든 패턴이 실패하면 현재 시간 반환
-        fallback = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        logging.warning(f"날짜 정형화 실패, 현재 시간 사용: '{datetime_str}' → '{fallback}'")
+        fallback = now.strftime('%Y-%m-%d %H:%M:%S')
+        logger.warning("날짜 정형화 실패, 현재 시간 사용: '%s' → '%s'", datetime_str, fallback)
         return fallback
     
     def analyze_datetime(self, datetime_str: str) -> dict:
@@ -649,25 +862,10 @@ class ReceiptProcessor:
             
             # 요일 분석 (0=월요일, 6=일요일)
             weekday = dt.weekday()
-            weekday_names = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
             
             # 시간대 분석
             hour = dt.hour
-            if 6 <= hour < 11:
-                time_period = "오전"
-                work_type = "조식/오전 업무"
-            elif 11 <= hour < 14:
-                time_period = "점심"
-                work_type = "점심식대"
-            elif 14 <= hour < 18:
-                time_period = "오후"
-                work_type = "오후 업무"
-            elif 18 <= hour < 22:
-                time_period = "야근"
-                work_type = "야근식대"
-            else:  # 22시 이후 또는 6시 이전
-                time_period = "심야"
-                work_type = "심야 야근식대"
+            time_period, work_type = HOUR_PERIODS[hour]
             
             # 근무일 구분
             if weekday < 5:  # 평일 (월~금)
@@ -684,7 +882,7 @@ class ReceiptProcessor:
                 work_context = f"일요 특근 {work_type.replace('식대', '식대')}"
             
             return {
-                "weekday": weekday_names[weekday],
+                "weekday": WEEKDAY_NAMES[weekday],
                 "day_type": day_type,
                 "hour": hour,
                 "time_period": time_period,
@@ -695,25 +893,35 @@ class ReceiptProcessor:
             }
         
         except Exception as e:
-            logging.error(f"날짜/시간 분석 실패: {e}")
-            return {
-                "weekday": "알 수 없음",
-                "day_type": "알 수 없음", 
-                "hour": 12,
-                "time_period": "점심",
-                "work_type": "점심식대",
-                "work_context": "기본 식대",
-                "is_weekend": False,
-                "is_overtime": False
-            }
+            logger.error("날짜/시간 분석 실패: %s", e)
+            return dict(DEFAULT_DATETIME_ANALYSIS)
 
 # 전역 프로세서 인스턴스
 processor = ReceiptProcessor()
 
+# 일괄 처리용 워커 풀 (요청 간 공유)
+batch_executor = ThreadPoolExecutor(max_workers=Config.OCR_CONCURRENCY, thread_name_prefix='receipt')
+
+def read_image_file(file: FileStorage):
+    """업로드 파일 검증 후 이미지 데이터 반환 - (image_data, error)"""
+    if not file or file.filename == '':
+        return None, "파일이 선택되지 않았습니다"
+    
+    # 이미지 파일 검증
+    if not file.filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+        return None, "PNG, JPG, JPEG 파일만 지원됩니다"
+    
+    # 이미지 데이터 읽기
+    image_data = file.read()
+    if len(image_data) == 0:
+        return None, "빈 파일입니다"
+    
+    return image_data, None
+
 @api.route('/process')
 class ReceiptProcess(Resource):
     @api.expect(upload_parser)
-    @api.marshal_with(response_model) # type: ignore
+    @api.response(200, '처리 성공', response_model)
     def post(self):
         """
         🧾 **영수증 자동 처리**
@@ -739,18 +947,9 @@ class ReceiptProcess(Resource):
             if 'image' not in request.files:
                 return {"success": False, "error": "이미지 파일이 필요합니다"}, 400
             
-            file = request.files['image']
-            if file.filename == '':
-                return {"success": False, "error": "파일이 선택되지 않았습니다"}, 400
-            
-            # 이미지 파일 검증
-            if not file.filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                return {"success": False, "error": "PNG, JPG, JPEG 파일만 지원됩니다"}, 400
-            
-            # 이미지 데이터 읽기
-            image_data = file.read()
-            if len(image_data) == 0:
-                return {"success": False, "error": "빈 파일입니다"}, 400
+            image_data, error = read_image_file(request.files['image'])
+            if error:
+                return {"success": False, "error": error}, 400
             
             # 영수증 처리
             result = processor.process_receipt(image_data)
@@ -761,7 +960,60 @@ class ReceiptProcess(Resource):
                 return result, 500
                 
         except Exception as e:
-            logging.error(f"API 처리 실패: {e}")
+            logger.error("API 처리 실패: %s", e)
+            return {"success": False, "error": str(e)}, 500
+
+@api.route('/process/batch')
+class ReceiptBatchProcess(Resource):
+    @api.expect(batch_upload_parser)
+    @api.response(200, '처리 성공', batch_response_model)
+    def post(self):
+        """
+        🧾 **영수증 일괄 처리**
+        
+        여러 장의 영수증 이미지를 한 번에 업로드하면 각 영수증을 병렬로 처리하여
+        업로드 순서대로 결과를 반환합니다.
+        
+        - 영수증별 처리 과정과 캐싱은 `/process`와 동일
+        - 동시 처리 수: `OCR_CONCURRENCY` (기본 4)
+        - 최대 이미지 수: `BATCH_MAX_IMAGES` (기본 20)
+        - 일부 영수증이 실패해도 나머지 결과는 정상 반환
+        """
+        start_time = time.perf_counter()
+        
+        try:
+            files = request.files.getlist('images')
+            if not files:
+                return {"success": False, "error": "이미지 파일이 필요합니다"}, 400
+            
+            if len(files) > Config.BATCH_MAX_IMAGES:
+                return {"success": False, "error": f"한 번에 최대 {Config.BATCH_MAX_IMAGES}개 파일까지 처리할 수 있습니다"}, 400
+            
+            # 파일 검증 후 유효한 이미지만 워커 풀에 제출
+            futures = []
+            for file in files:
+                image_data, error = read_image_file(file)
+                if error:
+                    futures.append((file.filename, None, error))
+                else:
+                    futures.append((file.filename, batch_executor.submit(processor.process_receipt, image_data), None))
+            
+            results = []
+            for filename, future, error in futures:
+                result = future.result() if future else {"success": False, "error": error}
+                results.append({"filename": filename, **result})
+            
+            processing_time = time.perf_counter() - start_time
+            logger.info("📦 일괄 처리 완료: %s/%s 성공", sum(r['success'] for r in results), len(results))
+            
+            return {
+                "success": True,
+                "results": results,
+                "processing_time": f"{processing_time:.2f}s"
+            }, 200
+            
+        except Exception as e:
+            logger.error("일괄 처리 실패: %s", e)
             return {"success": False, "error": str(e)}, 500
 
 @api.route('/health')
@@ -788,7 +1040,7 @@ class Health(Resource):
                 try:
                     redis_client.ping()
                     status["services"]["redis_ping"] = True
-                except:
+                except redis.RedisError:
                     status["services"]["redis_ping"] = False
             
             return status, 200
@@ -797,10 +1049,10 @@ class Health(Resource):
             return {"status": "error", "error": str(e)}, 500
 
 if __name__ == '__main__':
-    logging.info("🚀 Simple Receipt Processor 시작")
-    logging.info(f"📊 Redis 상태: {'연결됨' if redis_client else '비활성화'}")
-    logging.info(f"🤖 OpenAI 상태: {'연결됨' if openai_client else '비활성화'}")
-    logging.info(f"📸 CLOVA OCR 상태: {'설정됨' if Config.CLOVA_OCR_API_KEY else '미설정'}")
+    logger.info("🚀 Simple Receipt Processor 시작")
+    logger.info("📊 Redis 상태: %s", '연결됨' if redis_client else '비활성화')
+    logger.info("🤖 OpenAI 상태: %s", '연결됨' if openai_client else '비활성화')
+    logger.info("📸 CLOVA OCR 상태: %s", '설정됨' if Config.CLOVA_OCR_API_KEY else '미설정')
     
     app.run(
         host='0.0.0.0',